@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Maintenance commands for La Ferme des Mini-Pousses.
+
+Talks to Mongo directly (MONGO_URL and DB_NAME from backend/.env) instead of
+going through the public API:
+
+    python backend/cli.py update-images --dry-run
+    python backend/cli.py update-images --mapping zone_images.json --resume
+"""
+import asyncio
+import base64
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+import typer
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from PIL import Image
+from pymongo import UpdateOne
+
+from models import Zone
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+app = typer.Typer(help="La Ferme des Mini-Pousses maintenance commands")
+
+# Image mappings based on zone names
+DEFAULT_ZONE_IMAGES = {
+    "Poulailler": "https://images.unsplash.com/photo-1672620003939-f82a45cb5adc",
+    "Wallaby": "https://images.unsplash.com/photo-1511762996499-16c647c36eee",
+    "Rosie la vache avec Yukie le poulain": "https://images.unsplash.com/photo-1636014421603-97854d143a3e"
+}
+
+# Zone fields loaded from Mongo, leaving out the media blobs being replaced
+ZONE_FIELDS = [name for name in Zone.model_fields if name not in ("image_base64", "audio_base64")]
+
+def image_to_base64(content: bytes, max_size: Tuple[int, int] = (800, 600)) -> str:
+    """Resize an image and encode it as a base64 JPEG (runs in the process pool)"""
+    image = Image.open(io.BytesIO(content))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=85)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+def load_state(state_file: Path) -> Dict[str, dict]:
+    """Read images processed by an interrupted run, keyed by zone id"""
+    done = {}
+    if state_file.exists():
+        for line in state_file.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # line cut short by the interruption
+            done[entry["zone_id"]] = entry
+    return done
+
+async def update_zone_images(
+    db,
+    zone_images: Dict[str, str],
+    concurrency: int = 8,
+    processes: Optional[int] = None,
+    dry_run: bool = False,
+    state_file: Optional[Path] = None,
+    resume: bool = False,
+    on_start: Optional[Callable[[int], None]] = None,
+    on_progress: Optional[Callable[[str, bool], None]] = None
+) -> dict:
+    """Download, resize and store the image of every mapped zone.
+
+    Downloads run concurrently (at most `concurrency` at a time), resizing runs
+    in a process pool, and all zones are written with a single bulk_write.
+    Each processed image is appended to `state_file` so that a run started with
+    `resume` skips the zones an interrupted run already handled from the same
+    source URL.
+    """
+    documents = await db.zones.find({}, {"_id": 0, **{name: 1 for name in ZONE_FIELDS}}).to_list(None)
+    zones = [Zone(**document) for document in documents]
+    mapped = [zone for zone in zones if zone.name in zone_images]
+    summary = {
+        "zones": len(zones),
+        "unmapped": [zone.name for zone in zones if zone.name not in zone_images],
+        "updated": 0,
+        "failed": [],
+        "resumed": 0
+    }
+    if dry_run:
+        summary["would_update"] = [zone.name for zone in mapped]
+        return summary
+
+    done = load_state(state_file) if resume and state_file else {}
+    images = {
+        zone.id: done[zone.id]["image_base64"] for zone in mapped
+        if zone.id in done and done[zone.id].get("url") == zone_images[zone.name]
+    }
+    summary["resumed"] = len(images)
+    todo = [zone for zone in mapped if zone.id not in images]
+    if on_start:
+        on_start(len(todo))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    state = open(state_file, "a" if resume else "w") if state_file else None
+
+    async def process(zone: Zone, pool: ProcessPoolExecutor):
+        try:
+            async with semaphore:
+                response = await asyncio.to_thread(requests.get, zone_images[zone.name], timeout=30)
+            response.raise_for_status()
+            image_base64 = await loop.run_in_executor(pool, image_to_base64, response.content)
+        except Exception as e:
+            summary["failed"].append(f"{zone.name}: {e}")
+            ok = False
+        else:
+            images[zone.id] = image_base64
+            if state:
+                state.write(json.dumps({
+                    "zone_id": zone.id,
+                    "url": zone_images[zone.name],
+                    "image_base64": image_base64
+                }) + "\n")
+                state.flush()
+            ok = True
+        if on_progress:
+            on_progress(zone.name, ok)
+
+    try:
+        if todo:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                await asyncio.gather(*(process(zone, pool) for zone in todo))
+    finally:
+        if state:
+            state.close()
+
+    if images:
+        now = datetime.utcnow()
+        result = await db.zones.bulk_write([
+            UpdateOne({"id": zone_id}, {"$set": {"image_base64": image_base64, "updated_at": now}})
+            for zone_id, image_base64 in images.items()
+        ], ordered=False)
+        summary["updated"] = result.matched_count
+    if state_file and not summary["failed"]:
+        state_file.unlink(missing_ok=True)
+    return summary
+
+@app.command("update-images")
+def update_images(
+    mapping: Optional[Path] = typer.Option(None, help="JSON file mapping zone names to image URLs"),
+    concurrency: int = typer.Option(8, help="Maximum concurrent downloads"),
+    processes: Optional[int] = typer.Option(None, help="Image processing workers (default: CPU count)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="List the zones that would be updated"),
+    resume: bool = typer.Option(False, "--resume", help="Skip zones processed by an interrupted run"),
+    state_file: Path = typer.Option(Path(".update_images_state.jsonl"), help="Where progress is kept for --resume")
+):
+    """Update zone images from their source URLs"""
+    zone_images = json.loads(mapping.read_text()) if mapping else DEFAULT_ZONE_IMAGES
+    typer.echo("🌾 Updating zone images for La Ferme des Mini-Pousses...")
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    with typer.progressbar(length=len(zone_images), label="Processing images") as progress:
+        def on_start(total: int):
+            progress.length = total  # zones left once unmapped and resumed ones are skipped
+
+        summary = asyncio.run(update_zone_images(
+            db, zone_images,
+            concurrency=concurrency,
+            processes=processes,
+            dry_run=dry_run,
+            state_file=state_file,
+            resume=resume,
+            on_start=on_start,
+            on_progress=lambda name, ok: progress.update(1)
+        ))
+    client.close()
+
+    for name in summary["unmapped"]:
+        typer.echo(f"⚠️  No image mapping found for {name}")
+    if dry_run:
+        for name in summary["would_update"]:
+            typer.echo(f"Would update {name}")
+        return
+    for failure in summary["failed"]:
+        typer.echo(f"❌ {failure}")
+    if summary["resumed"]:
+        typer.echo(f"Reused {summary['resumed']} images from the interrupted run")
+    typer.echo(f"\n🎉 Updated {summary['updated']} of {summary['zones']} zones")
+    if summary["failed"]:
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
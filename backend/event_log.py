@@ -0,0 +1,245 @@
+"""Durable local event log for visitor session writes.
+
+Events are appended to fixed-size, memory-mapped segment files before they
+are shipped to Mongo, so visits keep being accepted while the database is slow
+or down. Each record is `<length><crc32><json>`; a zero length marks the end
+of the written part of a segment, and a bad checksum marks a torn write left
+by a crash. Appends land in the page cache right away (which survives the
+process being killed) and are flushed to disk in batches.
+
+A directory holds the log of a single writer: opening it takes an exclusive
+lock and fails if another EventLog (in this or another process) holds it, so
+each server worker needs its own directory.
+
+`EventShipper` delivers the log at least once: the read cursor is only
+committed after the shipping callback succeeds, so events carry an `event_id`
+that the callback uses to make replays harmless.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("<II")  # payload length, crc32 of payload
+
+Position = Tuple[int, int]  # (segment index, byte offset)
+
+
+class EventLogLockedError(RuntimeError):
+    """Raised when another writer already has the log directory open"""
+
+
+class EventLog:
+    """Segmented append-only log of JSON events"""
+
+    def __init__(self, directory, segment_size: int = 4 * 1024 * 1024,
+                 flush_every: int = 256, flush_interval: float = 0.05):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(self.directory / "lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._lock_fd)
+            raise EventLogLockedError(
+                f"Event log {self.directory} is already open by another writer; "
+                "give each worker its own EVENT_LOG_DIR"
+            )
+        self.segment_size = segment_size
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._cursor_path = self.directory / "cursor.json"
+        self._cursor = self._load_cursor()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+        segments = self._segment_indexes()
+        if not segments:
+            self._cursor = (self._cursor[0], 0)
+        self._index = segments[-1] if segments else self._cursor[0]
+        self._fd, self._mm = self._open_segment(self._index, self.segment_size)
+        self._offset = self._recover_offset()
+
+    # Segment files
+
+    def _segment_path(self, index: int) -> Path:
+        return self.directory / f"{index:08d}.seg"
+
+    def _segment_indexes(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.directory.glob("*.seg"))
+
+    def _open_segment(self, index: int, size: int):
+        fd = os.open(self._segment_path(index), os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        return fd, mmap.mmap(fd, os.fstat(fd).st_size)
+
+    def _recover_offset(self) -> int:
+        """Find the end of the valid records and wipe any torn tail after it"""
+        offset = 0
+        for _, end in _scan(self._mm, 0):
+            offset = end
+        if self._mm[offset:].rstrip(b"\0"):
+            self._mm[offset:] = bytes(len(self._mm) - offset)
+            self._mm.flush()
+        return offset
+
+    def _roll(self, size: int):
+        self.flush()
+        self._mm.close()
+        os.close(self._fd)
+        self._index += 1
+        self._fd, self._mm = self._open_segment(self._index, size)
+        self._offset = 0
+
+    # Writing
+
+    def append(self, event: dict) -> Position:
+        """Append an event and return the position right after it"""
+        payload = json.dumps(event, separators=(",", ":")).encode()
+        record = HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        if self._offset + len(record) > len(self._mm):
+            self._roll(max(self.segment_size, len(record)))
+        self._mm[self._offset:self._offset + len(record)] = record
+        self._offset += len(record)
+
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return self._index, self._offset
+
+    def flush(self):
+        """Force appended events to disk"""
+        if self._unflushed:
+            self._mm.flush()
+            self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    # Reading
+
+    def read_pending(self, limit: Optional[int] = None) -> List[Tuple[Position, dict]]:
+        """Return events after the committed cursor, oldest first"""
+        events = []
+        index, offset = self._cursor
+        while index <= self._index and (limit is None or len(events) < limit):
+            if index == self._index:
+                records = _scan(self._mm, offset, self._offset)
+            else:
+                path = self._segment_path(index)
+                records = _scan(path.read_bytes(), offset) if path.exists() else []
+            for payload, end in records:
+                events.append(((index, end), json.loads(payload)))
+                if limit is not None and len(events) >= limit:
+                    break
+            index, offset = index + 1, 0
+        return events
+
+    def commit(self, position: Position):
+        """Mark everything up to `position` as shipped and drop finished segments"""
+        self._cursor = position
+        tmp_path = self._cursor_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as cursor_file:
+            json.dump(list(position), cursor_file)
+            cursor_file.flush()
+            os.fsync(cursor_file.fileno())
+        os.replace(tmp_path, self._cursor_path)
+        for index in self._segment_indexes():
+            if index < position[0]:
+                self._segment_path(index).unlink()
+
+    def _load_cursor(self) -> Position:
+        try:
+            index, offset = json.loads(self._cursor_path.read_text())
+            return index, offset
+        except (FileNotFoundError, ValueError):
+            segments = self._segment_indexes()
+            return (segments[0] if segments else 0), 0
+
+    def close(self):
+        self.flush()
+        self._mm.close()
+        os.close(self._fd)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        os.close(self._lock_fd)
+
+
+def _scan(buffer, offset: int, end: Optional[int] = None):
+    """Yield (payload, end offset) for each valid record from `offset`"""
+    end = len(buffer) if end is None else end
+    while offset + HEADER.size <= end:
+        length, crc = HEADER.unpack_from(buffer, offset)
+        start = offset + HEADER.size
+        if length == 0 or start + length > end:
+            return
+        payload = bytes(buffer[start:start + length])
+        if zlib.crc32(payload) != crc:
+            return
+        offset = start + length
+        yield payload, offset
+
+
+class EventShipper:
+    """Background task delivering logged events with at-least-once semantics"""
+
+    def __init__(self, log: EventLog, ship: Callable[[List[dict]], Awaitable[None]],
+                 on_shipped: Optional[Callable[[List[dict]], None]] = None,
+                 batch_size: int = 500, interval: float = 0.2, max_backoff: float = 10.0):
+        self.log = log
+        self.ship = ship
+        self.on_shipped = on_shipped
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._task: Optional[asyncio.Task] = None
+
+    async def ship_pending(self) -> int:
+        """Ship one batch of pending events, returning how many were shipped"""
+        self.log.flush()
+        batch = self.log.read_pending(self.batch_size)
+        if not batch:
+            return 0
+        events = [event for _, event in batch]
+        await self.ship(events)
+        self.log.commit(batch[-1][0])
+        if self.on_shipped:
+            self.on_shipped(events)
+        return len(events)
+
+    async def run(self):
+        failures = 0
+        while True:
+            try:
+                shipped = await self.ship_pending()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Shipping events failed ({failures} in a row): {e}")
+                await asyncio.sleep(min(self.interval * 2 ** failures, self.max_backoff))
+                continue
+            if shipped < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the background task and make a last attempt to drain the log"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        try:
+            while await self.ship_pending():
+                pass
+        except Exception as e:
+            logger.warning(f"Events left in the local log for the next start: {e}")
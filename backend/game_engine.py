@@ -0,0 +1,224 @@
+"""Game engine for the farm zones.
+
+Answers are checked against a precompiled index of each zone's game instead of
+the raw zone document: accepted answers are normalized once (case, accents,
+ligatures, punctuation) so French answers match however the kids type them.
+"""
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Types whose answers are typed freely rather than picked from the options
+FREE_TEXT_TYPES = {"audio_riddle", "image_riddle", "observation"}
+
+TRUE_FALSE_SYNONYMS = {
+    "vrai": "vrai", "true": "vrai", "oui": "vrai",
+    "faux": "faux", "false": "faux", "non": "faux",
+}
+
+FRENCH_NUMBERS = {
+    "zero": 0, "un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4,
+    "cinq": 5, "six": 6, "sept": 7, "huit": 8, "neuf": 9, "dix": 10,
+    "onze": 11, "douze": 12, "treize": 13, "quatorze": 14, "quinze": 15,
+    "seize": 16, "vingt": 20, "vingts": 20, "trente": 30, "quarante": 40,
+    "cinquante": 50, "soixante": 60, "cent": 100, "cents": 100, "mille": 1000,
+}
+
+LEADING_ARTICLES = ("le ", "la ", "les ", "l ", "un ", "une ", "des ", "du ", "de la ", "de l ")
+
+LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE", "ß": "ss"})
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_answer(text: str) -> str:
+    """Normalize an answer for accent- and case-insensitive matching"""
+    text = unicodedata.normalize("NFKD", text.translate(LIGATURES))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def strip_article(normalized: str) -> str:
+    """Drop a leading French article ("la poule" -> "poule")"""
+    for article in LEADING_ARTICLES:
+        if normalized.startswith(article):
+            return normalized[len(article):]
+    return normalized
+
+
+def _below_twenty(words: List[str], i: int) -> Optional[Tuple[int, int]]:
+    """Read 1-19 at words[i]; return the value and the index after it"""
+    value = FRENCH_NUMBERS.get(words[i]) if i < len(words) else None
+    if value is None or not 1 <= value <= 16:
+        return None
+    if value == 10 and i + 1 < len(words) and words[i + 1] in ("sept", "huit", "neuf"):
+        return 10 + FRENCH_NUMBERS[words[i + 1]], i + 2
+    return value, i + 1
+
+
+def _below_hundred(words: List[str], i: int) -> Optional[Tuple[int, int]]:
+    """Read 1-99 at words[i]; return the value and the index after it"""
+    if words[i:i + 2] in (["quatre", "vingt"], ["quatre", "vingts"]):
+        tens, i = 80, i + 2
+    elif i < len(words) and FRENCH_NUMBERS.get(words[i]) in (20, 30, 40, 50, 60):
+        tens, i = FRENCH_NUMBERS[words[i]], i + 1
+    else:
+        return _below_twenty(words, i)
+    if i < len(words) and words[i] == "et":
+        # only "vingt et un", ..., "soixante et un" and "soixante et onze"
+        allowed = () if tens == 80 else ("un", "une", "onze") if tens == 60 else ("un", "une")
+        if i + 1 < len(words) and words[i + 1] in allowed:
+            return tens + FRENCH_NUMBERS[words[i + 1]], i + 2
+        return None
+    units = _below_twenty(words, i)
+    # a unit follows any tens word, 10-19 only follow soixante and quatre-vingt
+    if units and (units[0] <= 9 or tens in (60, 80)):
+        return tens + units[0], units[1]
+    return tens, i
+
+
+def _below_thousand(words: List[str], i: int) -> Optional[Tuple[int, int]]:
+    """Read 1-999 at words[i]; return the value and the index after it"""
+    hundreds = 0
+    if i < len(words) and words[i] in ("cent", "cents"):
+        hundreds, i = 100, i + 1
+    elif i + 1 < len(words) and words[i + 1] in ("cent", "cents") and 2 <= FRENCH_NUMBERS.get(words[i], 0) <= 9:
+        hundreds, i = FRENCH_NUMBERS[words[i]] * 100, i + 2
+    rest = _below_hundred(words, i)
+    if rest is None:
+        return (hundreds, i) if hundreds else None
+    return hundreds + rest[0], rest[1]
+
+
+def parse_french_number(words: List[str]) -> Optional[int]:
+    """Read a number written in French words ("dix sept", "quatre vingt onze"), or None"""
+    if words == ["zero"]:
+        return 0
+    group = _below_thousand(words, 0)
+    value, i = group if group else (None, 0)
+    if i < len(words) and words[i] == "mille":
+        value, i = (value or 1) * 1000, i + 1
+        group = _below_thousand(words, i)
+        if group:
+            value, i = value + group[0], group[1]
+    return value if i == len(words) else None
+
+
+def parse_number(normalized: str) -> Optional[int]:
+    """Read a count typed as digits or French words, optionally followed by a noun"""
+    words = normalized.split()
+    if not words:
+        return None
+    if words[0].isdecimal():  # isdigit() also accepts characters int() cannot read
+        number, rest = int(words[0]), words[1:]
+    else:
+        length = 0
+        while length < len(words) and (words[length] in FRENCH_NUMBERS or words[length] == "et"):
+            length += 1
+        if not length:
+            return None
+        number, rest = parse_french_number(words[:length]), words[length:]
+    if rest and (rest[0].isdigit() or rest[0] in FRENCH_NUMBERS):
+        return None
+    return number
+
+
+def canonical_answer(question_type: str, answer: str) -> str:
+    """Reduce an answer to the form stored in the answer index"""
+    normalized = normalize_answer(answer)
+    if question_type == "true_false":
+        return TRUE_FALSE_SYNONYMS.get(normalized, normalized)
+    if question_type in FREE_TEXT_TYPES:
+        return strip_article(normalized)
+    return normalized
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    id: str
+    type: str
+    accepted: FrozenSet[str]
+    number: Optional[int]  # observation games that ask for a count
+    explanation: str
+
+    def check(self, answer: str) -> bool:
+        if self.number is not None:
+            return parse_number(normalize_answer(answer)) == self.number
+        return canonical_answer(self.type, answer) in self.accepted
+
+
+@dataclass(frozen=True)
+class CompiledGame:
+    questions: Tuple[CompiledQuestion, ...]
+    by_id: Dict[str, CompiledQuestion]
+
+    def question(self, question_id: Optional[str] = None) -> Optional[CompiledQuestion]:
+        if question_id is None:
+            return self.questions[0]
+        return self.by_id.get(question_id)
+
+    def next_question_id(self, question_id: str) -> Optional[str]:
+        ids = [question.id for question in self.questions]
+        index = ids.index(question_id) + 1
+        return ids[index] if index < len(ids) else None
+
+
+def compile_question(question: dict) -> CompiledQuestion:
+    question_type = question.get("type", "quiz")
+    answers = [question["correct_answer"], *question.get("accepted_answers", [])]
+    number = None
+    if question_type == "observation":
+        number = parse_number(normalize_answer(question["correct_answer"]))
+    return CompiledQuestion(
+        id=question.get("id", ""),
+        type=question_type,
+        accepted=frozenset(canonical_answer(question_type, answer) for answer in answers),
+        number=number,
+        explanation=question.get("explanation", ""),
+    )
+
+
+def compile_game(game: dict) -> CompiledGame:
+    """Compile a game document (the first question plus any follow-ups)"""
+    questions = tuple(compile_question(question) for question in [game, *game.get("questions", [])])
+    return CompiledGame(questions=questions, by_id={question.id: question for question in questions})
+
+
+class GameEngine:
+    """Cache of compiled games keyed by zone id.
+
+    Entries expire after `ttl` seconds so that edits made through another
+    worker are picked up; edits made through this process call `invalidate`.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._games: Dict[str, Tuple[float, Optional[CompiledGame]]] = {}
+
+    def invalidate(self, zone_id: Optional[str] = None):
+        if zone_id is None:
+            self._games.clear()
+        else:
+            self._games.pop(zone_id, None)
+
+    def put(self, zone_id: str, game: Optional[dict]) -> Optional[CompiledGame]:
+        compiled = compile_game(game) if game else None
+        self._games[zone_id] = (time.monotonic() + self.ttl, compiled)
+        return compiled
+
+    async def get(self, zone_id: str, load: Callable[[], Awaitable[Optional[dict]]]) -> Tuple[bool, Optional[CompiledGame]]:
+        """Return (zone_found, compiled_game), calling `load` on a cache miss.
+
+        `load` returns the zone's `{"game": ...}` document or None when the
+        zone does not exist; missing zones are not cached.
+        """
+        cached = self._games.get(zone_id)
+        if cached and cached[0] > time.monotonic():
+            return True, cached[1]
+        zone = await load()
+        if zone is None:
+            self._games.pop(zone_id, None)
+            return False, None
+        return True, self.put(zone_id, zone.get("game"))
@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field, computed_field, model_validator
+from typing import Dict, List, Optional
+import uuid
+from datetime import datetime
+
+# Models for the farm zones
+class GameQuestion(BaseModel):
+    # Part of the VisitorSession.answers keys, so it must be safe in a Mongo field path
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), pattern=r"^[A-Za-z0-9_-]+$")
+    type: str  # "quiz", "true_false", "audio_riddle", "image_riddle", "observation"
+    question: str
+    options: List[str] = []
+    correct_answer: str
+    accepted_answers: List[str] = []  # other spellings accepted for riddles
+    explanation: str = ""
+
+class Game(GameQuestion):
+    questions: List[GameQuestion] = []  # follow-up questions for multi-question games
+
+    @model_validator(mode="after")
+    def check_unique_question_ids(self):
+        ids = [self.id, *(question.id for question in self.questions)]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Question ids must be unique within a game")
+        return self
+    
+class Zone(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    description: str
+    image_base64: str = ""
+    video_url: str = ""
+    audio_base64: str = ""
+    cta_text: str = "Découvrir"
+    cta_url: str = ""
+    game: Optional[Game] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+class ZoneCreate(BaseModel):
+    name: str
+    description: str
+    image_base64: str = ""
+    video_url: str = ""
+    audio_base64: str = ""
+    cta_text: str = "Découvrir"
+    cta_url: str = ""
+    game: Optional[Game] = None
+
+class VisitorSession(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    visited_zones: List[str] = []
+    total_zones: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    answers: Dict[str, bool] = {}  # "zone_id:question_id" -> first answer was correct
+    token: Optional[str] = None  # only set in "signed" session mode
+
+    @computed_field
+    @property
+    def score(self) -> int:
+        return sum(self.answers.values())
+
+class GameResponse(BaseModel):
+    zone_id: str
+    question_id: str
+    selected_answer: str
+    is_correct: bool
+    explanation: str
+    next_question_id: Optional[str] = None
+    score: Optional[int] = None  # only set when answering within a session
+    token: Optional[str] = None
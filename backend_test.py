@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import requests
 import json
+import jwt
 import unittest
 import os
 import sys
@@ -304,6 +305,175 @@ class FarmAPITest(unittest.TestCase):
             print(f"❌ Visitor session test failed: {e}")
             raise
 
+    def test_07_signed_session_token(self):
+        """Test visitor session endpoints in signed-token mode"""
+        print("\nTesting signed visitor session token...")
+        try:
+            response = requests.post(f"{API_URL}/session")
+            self.assertEqual(response.status_code, 200, f"Failed to create session: {response.text}")
+            session = response.json()
+            if not session.get("token"):
+                self.skipTest("Backend is not running with SESSION_MODE=signed")
+            session_id = session["id"]
+            headers = {"X-Session-Token": session["token"]}
+            
+            # Mark zone as visited and keep the refreshed token
+            print(f"Marking zone {self.test_zone_id} as visited...")
+            response = requests.post(f"{API_URL}/session/{session_id}/visit/{self.test_zone_id}", headers=headers)
+            self.assertEqual(response.status_code, 200, f"Failed to mark zone as visited: {response.text}")
+            visit_result = response.json()
+            self.assertEqual(visit_result["visited_count"], 1, "Expected visited count to be 1")
+            self.assertIn("token", visit_result, "Refreshed token not found in response")
+            
+            # Progress is read back from the token alone
+            print("Verifying zone was marked as visited...")
+            response = requests.get(f"{API_URL}/session/{session_id}", headers={"X-Session-Token": visit_result["token"]})
+            self.assertEqual(response.status_code, 200, f"Failed to get session: {response.text}")
+            self.assertIn(self.test_zone_id, response.json()["visited_zones"], "Zone not marked as visited")
+            
+            # Tokens carry an expiry that is pushed back on every visit
+            claims = jwt.decode(visit_result["token"], options={"verify_signature": False})
+            self.assertIn("exp", claims, "Token has no expiry")
+            self.assertGreaterEqual(claims["exp"], jwt.decode(session["token"], options={"verify_signature": False})["exp"],
+                                    "Refreshed token should not expire earlier")
+            
+            # Missing and tampered tokens are rejected
+            print("Testing with missing and tampered tokens...")
+            response = requests.get(f"{API_URL}/session/{session_id}")
+            self.assertEqual(response.status_code, 401, "Expected 401 for missing token")
+            response = requests.get(f"{API_URL}/session/{session_id}", headers={"X-Session-Token": session["token"] + "x"})
+            self.assertEqual(response.status_code, 401, "Expected 401 for tampered token")
+            
+            # A token cannot be replayed for another session
+            response = requests.get(f"{API_URL}/session/invalid-id", headers=headers)
+            self.assertEqual(response.status_code, 404, "Expected 404 for mismatched session ID")
+            print("✅ Signed visitor session test passed")
+        except unittest.SkipTest:
+            raise
+        except Exception as e:
+            print(f"❌ Signed visitor session test failed: {e}")
+            raise
+
+    def test_08_multi_question_game(self):
+        """Test normalized answers and per-session scoring for multi-question games"""
+        print("\nTesting multi-question game...")
+        try:
+            new_zone = {
+                "name": "Test Game Zone",
+                "description": "Zone created by the test suite to test the game engine",
+                "game": {
+                    "type": "quiz",
+                    "question": "Combien d'œufs une poule pond-elle par jour ?",
+                    "options": ["1 œuf", "5 œufs"],
+                    "correct_answer": "1 œuf",
+                    "questions": [
+                        {
+                            "type": "image_riddle",
+                            "question": "Quel animal est sur la photo ?",
+                            "correct_answer": "Le wallaby",
+                            "accepted_answers": ["kangourou"]
+                        }
+                    ]
+                }
+            }
+            response = requests.post(f"{API_URL}/zones", json=new_zone)
+            self.assertEqual(response.status_code, 200, f"Failed to create zone: {response.text}")
+            zone = response.json()
+            zone_id = zone["id"]
+            second_question_id = zone["game"]["questions"][0]["id"]
+            
+            response = requests.post(f"{API_URL}/session")
+            session = response.json()
+            headers = {"X-Session-Token": session["token"]} if session.get("token") else {}
+            
+            try:
+                # Accents and case do not matter
+                print("Answering first question without accents...")
+                response = requests.post(
+                    f"{API_URL}/zones/{zone_id}/game/answer",
+                    data={"selected_answer": "1 OEUF", "session_id": session["id"]},
+                    headers=headers
+                )
+                self.assertEqual(response.status_code, 200, f"Failed to submit answer: {response.text}")
+                result = response.json()
+                self.assertTrue(result["is_correct"], "Normalized answer was marked as incorrect")
+                self.assertEqual(result["next_question_id"], second_question_id, "Next question ID mismatch")
+                self.assertEqual(result["score"], 1, "Expected score to be 1")
+                if result.get("token"):
+                    headers = {"X-Session-Token": result["token"]}
+                
+                # Riddles accept alternatives and ignore articles
+                print("Answering riddle with an accepted alternative...")
+                response = requests.post(
+                    f"{API_URL}/zones/{zone_id}/game/answer",
+                    data={"selected_answer": "un kangourou", "question_id": second_question_id, "session_id": session["id"]},
+                    headers=headers
+                )
+                self.assertEqual(response.status_code, 200, f"Failed to submit answer: {response.text}")
+                result = response.json()
+                self.assertTrue(result["is_correct"], "Accepted answer was marked as incorrect")
+                self.assertIsNone(result["next_question_id"], "Expected no further question")
+                self.assertEqual(result["score"], 2, "Expected score to be 2")
+                if result.get("token"):
+                    headers = {"X-Session-Token": result["token"]}
+                
+                # Only the first answer to a question is scored
+                print("Answering the first question again...")
+                response = requests.post(
+                    f"{API_URL}/zones/{zone_id}/game/answer",
+                    data={"selected_answer": "5 œufs", "session_id": session["id"]},
+                    headers=headers
+                )
+                self.assertEqual(response.status_code, 200, f"Failed to submit answer: {response.text}")
+                result = response.json()
+                self.assertFalse(result["is_correct"], "Wrong answer was marked as correct")
+                self.assertEqual(result["score"], 2, "A second answer should not change the score")
+                
+                # Question ids must be unique and safe to use as keys
+                invalid_zone = dict(new_zone, game=dict(new_zone["game"], id="q.1"))
+                response = requests.post(f"{API_URL}/zones", json=invalid_zone)
+                self.assertEqual(response.status_code, 422, "Expected 422 for a question id containing a dot")
+                
+                # Unknown question
+                response = requests.post(
+                    f"{API_URL}/zones/{zone_id}/game/answer",
+                    data={"selected_answer": "1 œuf", "question_id": "invalid-id"}
+                )
+                self.assertEqual(response.status_code, 404, "Expected 404 for invalid question ID")
+            finally:
+                requests.delete(f"{API_URL}/zones/{zone_id}")
+            print("✅ Multi-question game test passed")
+        except Exception as e:
+            print(f"❌ Multi-question game test failed: {e}")
+            raise
+
+    def test_09_zone_field_selection(self):
+        """Test GET /api/zones/{zone_id}?fields= endpoint"""
+        print(f"\nTesting GET /api/zones/{self.test_zone_id}?fields=...")
+        try:
+            response = requests.get(f"{API_URL}/zones/{self.test_zone_id}", params={"fields": "name"})
+            self.assertEqual(response.status_code, 200, f"Failed to get zone: {response.text}")
+            zone = response.json()
+            self.assertEqual(set(zone), {"id", "name"}, "Expected only id and name")
+            self.assertEqual(zone["id"], self.test_zone_id, "Zone ID mismatch")
+            
+            response = requests.get(f"{API_URL}/zones/{self.test_zone_id}", params={"fields": "name,game"})
+            self.assertEqual(response.status_code, 200, f"Failed to get zone: {response.text}")
+            zone = response.json()
+            self.assertEqual(set(zone), {"id", "name", "game"}, "Expected only id, name and game")
+            self.assertIn("correct_answer", zone["game"], "Game not returned in full")
+            
+            # Unknown fields and zones
+            print("Testing with unknown field and invalid zone ID...")
+            response = requests.get(f"{API_URL}/zones/{self.test_zone_id}", params={"fields": "name,unknown"})
+            self.assertEqual(response.status_code, 400, "Expected 400 for unknown field")
+            response = requests.get(f"{API_URL}/zones/invalid-id", params={"fields": "name"})
+            self.assertEqual(response.status_code, 404, "Expected 404 for invalid zone ID")
+            print("✅ Zone field selection test passed")
+        except Exception as e:
+            print(f"❌ Zone field selection test failed: {e}")
+            raise
+
 if __name__ == "__main__":
     # Run tests with better error handling
     test_suite = unittest.TestSuite()
@@ -313,6 +483,9 @@ if __name__ == "__main__":
     test_suite.addTest(FarmAPITest('test_04_qr_code_generation'))
     test_suite.addTest(FarmAPITest('test_05_game_answer'))
     test_suite.addTest(FarmAPITest('test_06_visitor_session'))
+    test_suite.addTest(FarmAPITest('test_07_signed_session_token'))
+    test_suite.addTest(FarmAPITest('test_08_multi_question_game'))
+    test_suite.addTest(FarmAPITest('test_09_zone_field_selection'))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(test_suite)
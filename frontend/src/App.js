@@ -5,6 +5,9 @@ import axios from 'axios';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Signed visitor sessions carry their progress in a token sent back on each call
+const sessionHeaders = (token) => (token ? { 'X-Session-Token': token } : {});
+
 // Zone Card Component
 const ZoneCard = ({ zone, onVisit, isVisited }) => {
   const [showGame, setShowGame] = useState(false);
@@ -212,10 +215,15 @@ const App = () => {
     if (!session) return;
     
     try {
-      await axios.post(`${API}/session/${session.id}/visit/${zoneId}`);
+      const visitResponse = await axios.post(`${API}/session/${session.id}/visit/${zoneId}`, null, {
+        headers: sessionHeaders(session.token),
+      });
       
-      // Update session
-      const sessionResponse = await axios.get(`${API}/session/${session.id}`);
+      // Update session (signed sessions hand back a refreshed token)
+      const token = visitResponse.data.token || session.token;
+      const sessionResponse = await axios.get(`${API}/session/${session.id}`, {
+        headers: sessionHeaders(token),
+      });
       setSession(sessionResponse.data);
     } catch (error) {
       console.error('Error marking zone as visited:', error);
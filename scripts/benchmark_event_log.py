@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Measure append throughput of the local visitor event log.
+
+Appends zone_visited events like the ones the backend writes and reports
+events/s for several flush batch sizes, flushing after every event included
+for comparison. Runs in-process in a temporary directory.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from event_log import EventLog
+
+def visit_event():
+    return {
+        "event_id": str(uuid.uuid4()),
+        "type": "zone_visited",
+        "session_id": str(uuid.uuid4()),
+        "at": datetime.utcnow().isoformat(),
+        "zone_id": str(uuid.uuid4()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000, help="events to append per run")
+    args = parser.parse_args()
+
+    events = [visit_event() for _ in range(args.events)]
+    print(f"🌾 Appending {args.events} events")
+    for flush_every in (1, 64, 256, 4096):
+        with tempfile.TemporaryDirectory() as directory:
+            log = EventLog(directory, flush_every=flush_every, flush_interval=float("inf"))
+            start = time.perf_counter()
+            for event in events:
+                log.append(event)
+            log.flush()
+            elapsed = time.perf_counter() - start
+            log.close()
+        print(f"flush every {flush_every:>5} events: {args.events / elapsed:>10,.0f} events/s")
+
+if __name__ == "__main__":
+    main()
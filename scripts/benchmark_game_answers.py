@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Measure answer-check throughput of the game engine.
+
+Compares the compiled answer index against compiling the game on every
+answer, which is roughly what checking the raw zone document costs. Runs
+in-process: no backend or database needed.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from game_engine import compile_game
+
+GAME = {
+    "id": "q1",
+    "type": "quiz",
+    "question": "Combien d'œufs une poule peut-elle pondre par jour ?",
+    "options": ["1 œuf", "5 œufs", "10 œufs"],
+    "correct_answer": "1 œuf",
+    "questions": [
+        {"id": "q2", "type": "true_false", "question": "Les vaches mangent seulement de l'herbe ?",
+         "options": ["Vrai", "Faux"], "correct_answer": "Faux"},
+        {"id": "q3", "type": "image_riddle", "question": "Qui est-ce ?", "correct_answer": "Le wallaby",
+         "accepted_answers": ["kangourou", "petit kangourou"]},
+        {"id": "q4", "type": "observation", "question": "Combien de poules vois-tu ?", "correct_answer": "3"},
+    ],
+}
+
+ANSWERS = [
+    ("q1", "1 œuf"), ("q1", "1 OEUF"), ("q1", "5 œufs"),
+    ("q2", "faux"), ("q2", "Non"), ("q2", "Vrai"),
+    ("q3", "Wallaby"), ("q3", "un kangourou"), ("q3", "la poule"),
+    ("q4", "trois"), ("q4", "3"), ("q4", "quatre"),
+]
+
+def run(label, check, answers):
+    start = time.perf_counter()
+    correct = sum(check(question_id, answer) for question_id, answer in answers)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {len(answers) / elapsed:>12,.0f} checks/s ({correct} correct)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=200_000, help="number of answers to check")
+    args = parser.parse_args()
+
+    answers = [random.choice(ANSWERS) for _ in range(args.checks)]
+    compiled = compile_game(GAME)
+
+    print(f"🌾 Checking {args.checks} answers")
+    run("compiled index", lambda question_id, answer: compiled.question(question_id).check(answer), answers)
+    run("compile per answer", lambda question_id, answer: compile_game(GAME).question(question_id).check(answer), answers)
+
+if __name__ == "__main__":
+    main()
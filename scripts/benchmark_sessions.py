@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Measure visit throughput for visitor sessions.
+
+Simulates groups of kids scanning QR codes in parallel: each worker owns a
+session and marks every zone as visited. Run it once against a backend started
+with SESSION_MODE=db and once with SESSION_MODE=signed to compare both modes.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / "frontend" / ".env")
+
+BACKEND_URL = os.environ.get("REACT_APP_BACKEND_URL")
+API_URL = f"{BACKEND_URL}/api"
+
+def run_visitor(zone_ids):
+    """Create a session and visit every zone, returning per-visit latencies"""
+    http = requests.Session()
+    session = http.post(f"{API_URL}/session").json()
+    token = session.get("token")
+    latencies = []
+    for zone_id in zone_ids:
+        headers = {"X-Session-Token": token} if token else {}
+        start = time.perf_counter()
+        response = http.post(f"{API_URL}/session/{session['id']}/visit/{zone_id}", headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        token = response.json().get("token", token)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visitors", type=int, default=200, help="number of sessions")
+    parser.add_argument("--concurrency", type=int, default=20, help="parallel visitors")
+    args = parser.parse_args()
+
+    zone_ids = [zone["id"] for zone in requests.get(f"{API_URL}/zones").json()]
+    if not zone_ids:
+        print("No zones found, call /api/init-sample-data first")
+        return
+
+    mode = "signed" if requests.post(f"{API_URL}/session").json().get("token") else "db"
+    print(f"🌾 Benchmarking {mode} sessions: {args.visitors} visitors x {len(zone_ids)} zones, concurrency {args.concurrency}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run_visitor, [zone_ids] * args.visitors))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    print(f"Visits: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} visits/s)")
+    print(f"Latency p50: {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p95: {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
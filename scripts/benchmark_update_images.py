@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Compare zone image update runtimes: old sequential flow vs backend/cli.py.
+
+Seeds `--zones` zones into a separate benchmark database and serves generated
+JPEGs from a local HTTP server, so no real images are downloaded. The
+baseline replays what the old scripts/update_zone_images.py did per zone: a
+blocking download, resizing in-process, then reading the full zone and
+writing it back. It talks to Mongo directly instead of through the API, so
+it leaves out the HTTP overhead and flatters the old flow.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from cli import image_to_base64, update_zone_images
+from motor.motor_asyncio import AsyncIOMotorClient
+
+def serve_images(latency: float) -> str:
+    """Serve the same 1600x1200 JPEG for every path, after `latency` seconds"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (120, 200, 80)).save(buffer, format="JPEG")
+    jpeg = buffer.getvalue()
+
+    class ImageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(jpeg)))
+            self.end_headers()
+            self.wfile.write(jpeg)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+async def seed_zones(db, count: int):
+    await db.zones.delete_many({})
+    await db.zones.insert_many([{
+        "id": str(uuid.uuid4()),
+        "name": f"Zone {i}",
+        "description": "Zone de test pour le benchmark",
+        "image_base64": "",
+        "video_url": "",
+        "audio_base64": "",
+        "cta_text": "Découvrir",
+        "cta_url": "",
+        "game": None,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    } for i in range(count)])
+
+async def sequential_update(db, zone_images):
+    """The old flow: one zone at a time, full read and full write per zone"""
+    for zone in await db.zones.find().to_list(None):
+        if zone["name"] not in zone_images:
+            continue
+        response = requests.get(zone_images[zone["name"]])
+        response.raise_for_status()
+        image_base64 = image_to_base64(response.content)
+        current = await db.zones.find_one({"id": zone["id"]})
+        current.update(image_base64=image_base64, updated_at=datetime.utcnow())
+        await db.zones.replace_one({"id": zone["id"]}, current)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, default=500, help="number of zones to update")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated download latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent downloads for the CLI")
+    parser.add_argument("--db-name", default=f"{os.environ.get('DB_NAME', 'test_database')}_benchmark",
+                        help="scratch database (emptied by the benchmark)")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[args.db_name]
+    base_url = serve_images(args.latency)
+    zone_images = {f"Zone {i}": f"{base_url}/images/{i}.jpg" for i in range(args.zones)}
+    print(f"🌾 Updating {args.zones} zones, {args.latency * 1000:.0f} ms per download, database {args.db_name}")
+
+    await seed_zones(db, args.zones)
+    start = time.perf_counter()
+    await sequential_update(db, zone_images)
+    print(f"{'sequential (old script)':<28} {time.perf_counter() - start:>8.2f}s")
+
+    await seed_zones(db, args.zones)
+    start = time.perf_counter()
+    summary = await update_zone_images(db, zone_images, concurrency=args.concurrency)
+    print(f"{'cli update-images':<28} {time.perf_counter() - start:>8.2f}s ({summary['updated']} updated)")
+
+    await client.drop_database(args.db_name)
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Measure payload size and latency of GET /api/zones/{zone_id} per field set.
+
+Run against a backend whose zones have images (see `backend/cli.py
+update-images`) to see what the media blobs cost when the caller does not
+need them.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / "frontend" / ".env")
+
+BACKEND_URL = os.environ.get("REACT_APP_BACKEND_URL")
+API_URL = f"{BACKEND_URL}/api"
+
+FIELD_SETS = [None, "name", "game", "name,description,cta_text,cta_url", "image_base64"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per field set")
+    args = parser.parse_args()
+
+    zone_ids = [zone["id"] for zone in requests.get(f"{API_URL}/zones").json()]
+    if not zone_ids:
+        print("No zones found, call /api/init-sample-data first")
+        return
+
+    http = requests.Session()
+    print(f"🌾 {args.requests} requests per field set over {len(zone_ids)} zones")
+    print(f"{'fields':<40} {'avg bytes':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for fields in FIELD_SETS:
+        params = {"fields": fields} if fields else {}
+        sizes, latencies = [], []
+        for i in range(args.requests):
+            start = time.perf_counter()
+            response = http.get(f"{API_URL}/zones/{zone_ids[i % len(zone_ids)]}", params=params)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            sizes.append(len(response.content))
+        latencies.sort()
+        print(f"{fields or '(all)':<40} {sum(sizes) / len(sizes):>10.0f} "
+              f"{latencies[len(latencies) // 2] * 1000:>8.1f} {latencies[int(len(latencies) * 0.95)] * 1000:>8.1f}")
+
+if __name__ == "__main__":
+    main()
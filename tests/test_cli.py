@@ -0,0 +1,137 @@
+import asyncio
+import base64
+import io
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from cli import update_zone_images
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return self.documents
+
+
+class FakeZones:
+    def __init__(self, names):
+        self.documents = [{"id": f"zone-{i}", "name": name, "description": ""} for i, name in enumerate(names)]
+        self.bulk_writes = []
+
+    def find(self, query, projection):
+        return FakeCursor([{k: v for k, v in document.items() if k in projection} for document in self.documents])
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.append(requests)
+        return SimpleNamespace(matched_count=len(requests))
+
+
+@pytest.fixture(scope="module")
+def image_server():
+    """Serve a 1600x1200 JPEG under /ok/..., a 404 anywhere else, and count requests"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (120, 200, 80)).save(buffer, format="JPEG")
+    jpeg = buffer.getvalue()
+    requested = []
+
+    class ImageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            if not self.path.startswith("/ok/"):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(jpeg)))
+            self.end_headers()
+            self.wfile.write(jpeg)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requested
+    server.shutdown()
+
+
+def run(db, zone_images, **kwargs):
+    return asyncio.run(update_zone_images(db, zone_images, processes=1, **kwargs))
+
+
+def test_dry_run_lists_zones_without_downloading(image_server, tmp_path):
+    base_url, requested = image_server
+    requested.clear()
+    db = SimpleNamespace(zones=FakeZones(["Poulailler", "Wallaby", "Mare"]))
+
+    summary = run(db, {"Poulailler": f"{base_url}/ok/1.jpg", "Wallaby": f"{base_url}/ok/2.jpg"},
+                  dry_run=True, state_file=tmp_path / "state.jsonl")
+
+    assert summary["would_update"] == ["Poulailler", "Wallaby"]
+    assert summary["unmapped"] == ["Mare"]
+    assert not requested
+    assert not db.zones.bulk_writes
+    assert not (tmp_path / "state.jsonl").exists()
+
+
+def test_updates_all_zones_with_a_single_bulk_write(image_server, tmp_path):
+    base_url, _ = image_server
+    db = SimpleNamespace(zones=FakeZones(["Poulailler", "Wallaby"]))
+
+    summary = run(db, {"Poulailler": f"{base_url}/ok/1.jpg", "Wallaby": f"{base_url}/ok/2.jpg"},
+                  state_file=tmp_path / "state.jsonl")
+
+    assert summary["updated"] == 2 and not summary["failed"]
+    assert len(db.zones.bulk_writes) == 1
+    image = Image.open(io.BytesIO(base64.b64decode(db.zones.bulk_writes[0][0]._doc["$set"]["image_base64"])))
+    assert image.size == (800, 600)
+    assert not (tmp_path / "state.jsonl").exists()
+
+
+def test_failures_keep_the_state_for_resume(image_server, tmp_path):
+    base_url, _ = image_server
+    db = SimpleNamespace(zones=FakeZones(["Poulailler", "Wallaby"]))
+    state_file = tmp_path / "state.jsonl"
+
+    summary = run(db, {"Poulailler": f"{base_url}/ok/1.jpg", "Wallaby": f"{base_url}/missing.jpg"},
+                  state_file=state_file)
+
+    assert summary["updated"] == 1
+    assert len(summary["failed"]) == 1 and summary["failed"][0].startswith("Wallaby: ")
+    assert [json.loads(line)["zone_id"] for line in state_file.read_text().splitlines()] == ["zone-0"]
+
+
+def test_resume_reuses_entries_only_for_the_same_url(image_server, tmp_path):
+    base_url, requested = image_server
+    db = SimpleNamespace(zones=FakeZones(["Poulailler", "Wallaby", "Vache"]))
+    state_file = tmp_path / "state.jsonl"
+    state_file.write_text(
+        json.dumps({"zone_id": "zone-0", "url": f"{base_url}/ok/1.jpg", "image_base64": "cached"}) + "\n"
+        + json.dumps({"zone_id": "zone-1", "url": f"{base_url}/ok/old.jpg", "image_base64": "stale"}) + "\n"
+        + '{"zone_id": "zone-2", "url": "'  # cut short by the interruption
+    )
+    requested.clear()
+
+    summary = run(db, {
+        "Poulailler": f"{base_url}/ok/1.jpg",
+        "Wallaby": f"{base_url}/ok/2.jpg",
+        "Vache": f"{base_url}/ok/3.jpg"
+    }, state_file=state_file, resume=True)
+
+    assert summary["resumed"] == 1 and summary["updated"] == 3
+    assert sorted(requested) == ["/ok/2.jpg", "/ok/3.jpg"]
+    assert len(db.zones.bulk_writes) == 1
+    images = {request._filter["id"]: request._doc["$set"]["image_base64"] for request in db.zones.bulk_writes[0]}
+    assert images["zone-0"] == "cached"
+    assert images["zone-1"] != "stale"
+    assert not state_file.exists()
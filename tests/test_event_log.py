@@ -0,0 +1,155 @@
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from event_log import EventLog, EventLogLockedError, EventShipper
+
+
+def event(seq):
+    return {"event_id": f"event-{seq}", "type": "zone_visited", "seq": seq}
+
+
+def test_append_and_read_back(tmp_path):
+    log = EventLog(tmp_path)
+    for seq in range(10):
+        log.append(event(seq))
+    assert [e["seq"] for _, e in log.read_pending()] == list(range(10))
+    assert [e["seq"] for _, e in log.read_pending(limit=3)] == [0, 1, 2]
+    log.close()
+
+
+def test_commit_survives_reopen(tmp_path):
+    log = EventLog(tmp_path)
+    for seq in range(10):
+        log.append(event(seq))
+    log.commit(log.read_pending(limit=4)[-1][0])
+    log.close()
+
+    log = EventLog(tmp_path)
+    assert [e["seq"] for _, e in log.read_pending()] == list(range(4, 10))
+    log.append(event(10))
+    assert log.read_pending()[-1][1]["seq"] == 10
+    log.close()
+
+
+def test_second_writer_is_refused(tmp_path):
+    log = EventLog(tmp_path)
+    log.append(event(0))
+    with pytest.raises(EventLogLockedError):
+        EventLog(tmp_path)
+    log.close()
+
+    # The lock is released on close
+    log = EventLog(tmp_path)
+    assert [e["seq"] for _, e in log.read_pending()] == [0]
+    log.close()
+
+
+def test_segments_roll_and_are_dropped_once_shipped(tmp_path):
+    log = EventLog(tmp_path, segment_size=256)
+    for seq in range(40):
+        log.append(event(seq))
+    assert len(list(tmp_path.glob("*.seg"))) > 1
+    pending = log.read_pending()
+    assert [e["seq"] for _, e in pending] == list(range(40))
+
+    log.commit(pending[-1][0])
+    assert len(list(tmp_path.glob("*.seg"))) == 1
+    assert log.read_pending() == []
+    log.close()
+
+
+def test_torn_write_is_discarded(tmp_path):
+    log = EventLog(tmp_path)
+    for seq in range(3):
+        log.append(event(seq))
+    end = log.read_pending()[-1][0][1]
+    log.close()
+
+    # Simulate a crash halfway through writing the next record
+    segment = next(tmp_path.glob("*.seg"))
+    with open(segment, "r+b") as segment_file:
+        segment_file.seek(end)
+        segment_file.write(b"\x40\x00\x00\x00\xde\xad\xbe\xef{\"event_id\":")
+
+    log = EventLog(tmp_path)
+    assert [e["seq"] for _, e in log.read_pending()] == [0, 1, 2]
+    log.append(event(3))
+    assert [e["seq"] for _, e in log.read_pending()] == [0, 1, 2, 3]
+    log.close()
+
+
+WRITER = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {backend!r})
+    from event_log import EventLog
+    log = EventLog({directory!r}, segment_size=4096)
+    seq = 0
+    while True:
+        log.append({{"event_id": f"event-{{seq}}", "seq": seq}})
+        print(seq, flush=True)
+        seq += 1
+""")
+
+
+def test_recovers_after_process_is_killed_mid_stream(tmp_path):
+    writer = subprocess.Popen(
+        [sys.executable, "-c", WRITER.format(backend=str(BACKEND_DIR), directory=str(tmp_path))],
+        stdout=subprocess.PIPE, text=True
+    )
+    acknowledged = -1
+    for line in writer.stdout:
+        acknowledged = int(line)
+        if acknowledged >= 2000:
+            break
+    os.kill(writer.pid, signal.SIGKILL)
+    writer.wait()
+
+    log = EventLog(tmp_path, segment_size=4096)
+    seqs = [e["seq"] for _, e in log.read_pending()]
+    assert seqs == list(range(len(seqs)))
+    assert len(seqs) > acknowledged
+    log.close()
+
+
+def test_shipper_retries_until_delivered(tmp_path):
+    log = EventLog(tmp_path)
+    for seq in range(5):
+        log.append(event(seq))
+    delivered, attempts = [], []
+
+    async def ship(events):
+        attempts.append(len(events))
+        if len(attempts) == 1:
+            raise ConnectionError("database unreachable")
+        delivered.extend(e["event_id"] for e in events)
+
+    shipper = EventShipper(log, ship, batch_size=10)
+    with pytest.raises(ConnectionError):
+        asyncio.run(shipper.ship_pending())
+    assert asyncio.run(shipper.ship_pending()) == 5
+    assert delivered == [f"event-{seq}" for seq in range(5)]
+    assert log.read_pending() == []
+    log.close()
+
+
+def test_unacknowledged_batch_is_redelivered_after_restart(tmp_path):
+    log = EventLog(tmp_path)
+    for seq in range(5):
+        log.append(event(seq))
+    # Shipped but the process died before committing the cursor
+    shipped_once = [e["event_id"] for _, e in log.read_pending()]
+    log.close()
+
+    log = EventLog(tmp_path)
+    assert [e["event_id"] for _, e in log.read_pending()] == shipped_once
+    log.close()
@@ -0,0 +1,121 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from game_engine import GameEngine, compile_game, normalize_answer, parse_number
+
+GAME = {
+    "id": "q1",
+    "type": "quiz",
+    "question": "Combien d'œufs une poule peut-elle pondre par jour ?",
+    "options": ["1 œuf", "5 œufs", "10 œufs"],
+    "correct_answer": "1 œuf",
+    "explanation": "Une poule pond généralement un œuf par jour.",
+    "questions": [
+        {"id": "q2", "type": "true_false", "question": "Le coq pond des œufs ?", "correct_answer": "Faux"},
+        {"id": "q3", "type": "image_riddle", "question": "Qui est-ce ?", "correct_answer": "Le wallaby",
+         "accepted_answers": ["kangourou"]},
+        {"id": "q4", "type": "observation", "question": "Combien de poules vois-tu ?", "correct_answer": "3"},
+    ],
+}
+
+
+def test_normalize_answer_ignores_case_accents_and_ligatures():
+    assert normalize_answer("  Élevé, l’ŒUF !") == normalize_answer("eleve l oeuf")
+
+
+def test_quiz_matches_normalized_option():
+    game = compile_game(GAME)
+    assert game.question().check("1 OEUF")
+    assert not game.question().check("5 œufs")
+
+
+def test_true_false_accepts_synonyms():
+    question = compile_game(GAME).question("q2")
+    assert question.check("non")
+    assert not question.check("Vrai")
+
+
+def test_riddle_ignores_articles_and_accepts_alternatives():
+    question = compile_game(GAME).question("q3")
+    assert question.check("wallaby")
+    assert question.check("un Kangourou")
+    assert not question.check("une poule")
+
+
+def test_observation_compares_counts():
+    question = compile_game(GAME).question("q4")
+    assert question.check("trois")
+    assert question.check("3 poules")
+    assert not question.check("4")
+
+
+def test_observation_reads_compound_french_numbers():
+    seventeen = compile_game({"id": "q", "type": "observation", "question": "", "correct_answer": "17"}).question()
+    assert seventeen.check("dix-sept")
+    assert seventeen.check("dix sept poules")
+    assert not seventeen.check("dix")
+
+    ten = compile_game({"id": "q", "type": "observation", "question": "", "correct_answer": "10"}).question()
+    assert not ten.check("dix-sept")
+
+    twenty_one = compile_game({"id": "q", "type": "observation", "question": "", "correct_answer": "vingt et un"}).question()
+    assert twenty_one.number == 21
+    assert twenty_one.check("21")
+    assert not twenty_one.check("20")
+
+
+def test_parse_number_rejects_what_it_cannot_read():
+    assert parse_number(normalize_answer("quatre-vingt-dix-neuf")) == 99
+    assert parse_number(normalize_answer("soixante et onze")) == 71
+    assert parse_number("dix dix") is None
+    assert parse_number("vingt et") is None
+    assert parse_number("17 3") is None
+    assert parse_number("poules") is None
+    for words in ("seize deux", "deux un", "neuf un", "trente vingt", "mille mille", "vingt dix", "quatre vingt et un"):
+        assert parse_number(words) is None, words
+    assert parse_number(normalize_answer("፩")) is None
+    assert parse_number(normalize_answer("deux cent quatre-vingts")) == 280
+    assert parse_number(normalize_answer("trois mille deux cents")) == 3200
+
+
+def test_multi_question_navigation():
+    game = compile_game(GAME)
+    assert [question.id for question in game.questions] == ["q1", "q2", "q3", "q4"]
+    assert game.next_question_id("q1") == "q2"
+    assert game.next_question_id("q4") is None
+    assert game.question("missing") is None
+
+
+def test_engine_loads_once_and_invalidates():
+    engine = GameEngine()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"game": GAME}
+
+    async def scenario():
+        await engine.get("zone", load)
+        await engine.get("zone", load)
+        engine.invalidate("zone")
+        return await engine.get("zone", load)
+
+    found, game = asyncio.run(scenario())
+    assert found and game.question().id == "q1"
+    assert len(loads) == 2
+
+
+def test_engine_reports_missing_zone_and_game():
+    engine = GameEngine()
+
+    async def missing():
+        return None
+
+    async def no_game():
+        return {}
+
+    assert asyncio.run(engine.get("zone", missing)) == (False, None)
+    assert asyncio.run(engine.get("zone", no_game)) == (True, None)
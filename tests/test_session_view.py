@@ -0,0 +1,215 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import ServerSelectionTimeoutError
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import server
+from event_log import EventLog, EventShipper
+from game_engine import GameEngine
+
+
+def matches(document, query):
+    for name, condition in query.items():
+        field, _, key = name.partition(".")
+        if isinstance(condition, dict):
+            if (field in document and (not key or key in document[field])) != condition["$exists"]:
+                return False
+        elif document.get(name) != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    """Just enough of a motor collection for the session event updates"""
+
+    def __init__(self, db):
+        self.db = db
+        self.documents = {}
+
+    async def find_one(self, query, *args):
+        self.db.check()
+        document = self.documents.get(query.get("id"))
+        return dict(document) if document else None
+
+    async def count_documents(self, query):
+        self.db.check()
+        return 3
+
+    async def bulk_write(self, requests, ordered=True):
+        self.db.check()
+        for request in requests:
+            key = request._filter.get("id", request._filter.get("_id"))
+            if key in self.documents:
+                document = self.documents[key]
+                if not matches(document, request._filter):
+                    continue
+            elif request._upsert:
+                document = self.documents[key] = {"id": key}
+            else:
+                continue
+            update = request._doc
+            for name, value in update.get("$setOnInsert", {}).items():
+                document.setdefault(name, value)
+            for name, value in update.get("$addToSet", {}).items():
+                if value not in document.setdefault(name, []):
+                    document[name].append(value)
+            for name, value in update.get("$set", {}).items():
+                field, _, question_id = name.partition(".")
+                document.setdefault(field, {})[question_id] = value
+            for name, value in update.get("$max", {}).items():
+                document[name] = max(document.get(name, value), value)
+
+
+class FakeDb:
+    def __init__(self):
+        self.up = True
+        self.sessions = FakeCollection(self)
+        self.session_events = FakeCollection(self)
+        self.zones = FakeCollection(self)
+
+    def check(self):
+        if not self.up:
+            raise ServerSelectionTimeoutError("mongo is down")
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    db = FakeDb()
+    log = EventLog(tmp_path)
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "SESSION_MODE", "db")
+    monkeypatch.setattr(server, "SESSION_READ_TIMEOUT", 1)
+    monkeypatch.setattr(server, "event_log", log)
+    monkeypatch.setattr(server, "event_shipper",
+                        EventShipper(log, server.ship_session_events, on_shipped=server.forget_shipped_events))
+    monkeypatch.setattr(server, "recent_sessions", server.OrderedDict())
+    monkeypatch.setattr(server, "pending_events", {})
+    monkeypatch.setattr(server, "game_engine", GameEngine())
+    yield db, tmp_path
+    server.event_log.close()
+
+
+def restart(tmp_path, monkeypatch):
+    """Drop the process state and reopen the log, as a new worker would"""
+    server.event_log.close()
+    log = EventLog(tmp_path)
+    monkeypatch.setattr(server, "event_log", log)
+    monkeypatch.setattr(server, "event_shipper",
+                        EventShipper(log, server.ship_session_events, on_shipped=server.forget_shipped_events))
+    monkeypatch.setattr(server, "recent_sessions", server.OrderedDict())
+    monkeypatch.setattr(server, "pending_events", {})
+    server.restore_pending_events()
+
+
+def test_visit_accepted_after_shipper_drained_and_db_down(backend):
+    db, _ = backend
+
+    async def scenario():
+        session = await server.create_session()
+        await server.mark_zone_visited(session.id, "poulailler", x_session_token=None)
+        await server.event_shipper.ship_pending()
+        assert not server.pending_events
+        assert db.sessions.documents[session.id]["visited_zones"] == ["poulailler"]
+
+        db.up = False
+        response = await server.mark_zone_visited(session.id, "wallaby", x_session_token=None)
+        assert response["visited_count"] == 2
+        assert (await server.get_session(session.id, x_session_token=None)).visited_zones == ["poulailler", "wallaby"]
+
+        db.up = True
+        await server.event_shipper.ship_pending()
+        assert db.sessions.documents[session.id]["visited_zones"] == ["poulailler", "wallaby"]
+
+    asyncio.run(scenario())
+
+
+def test_restart_keeps_events_of_shipped_sessions(backend, monkeypatch):
+    db, tmp_path = backend
+
+    async def create_and_visit():
+        session = await server.create_session()
+        await server.mark_zone_visited(session.id, "poulailler", x_session_token=None)
+        await server.event_shipper.ship_pending()
+        await server.mark_zone_visited(session.id, "wallaby", x_session_token=None)  # still in the log at restart
+        return session
+
+    session = asyncio.run(create_and_visit())
+    restart(tmp_path, monkeypatch)
+
+    async def after_restart():
+        assert (await server.get_session(session.id, x_session_token=None)).visited_zones == ["poulailler", "wallaby"]
+
+        restart(tmp_path, monkeypatch)
+        db.up = False
+        with pytest.raises(HTTPException) as error:
+            await server.get_session(session.id, x_session_token=None)
+        assert error.value.status_code == 503
+
+        response = await server.mark_zone_visited(session.id, "vache", x_session_token=None)
+        assert response == {"message": "Zone marked as visited"}  # earlier visits are unknown
+
+        db.up = True
+        await server.event_shipper.ship_pending()
+        assert db.sessions.documents[session.id]["visited_zones"] == ["poulailler", "wallaby", "vache"]
+
+    asyncio.run(after_restart())
+
+
+def test_answers_are_scored_per_zone(backend):
+    db, _ = backend
+    for zone_id in ("zone-a", "zone-b"):
+        db.zones.documents[zone_id] = {"id": zone_id, "game": {
+            "id": "q1", "type": "true_false", "question": "Le coq pond des œufs ?", "correct_answer": "Faux"
+        }}
+
+    async def scenario():
+        session = await server.create_session()
+        def answer(zone_id):
+            return server.answer_game(zone_id, "faux", question_id=None, session_id=session.id, x_session_token=None)
+
+        first, repeated, other_zone = await answer("zone-a"), await answer("zone-a"), await answer("zone-b")
+        assert (first.score, repeated.score, other_zone.score) == (1, 1, 2)
+
+        await server.event_shipper.ship_pending()
+        assert db.sessions.documents[session.id]["answers"] == {"zone-a:q1": True, "zone-b:q1": True}
+
+    asyncio.run(scenario())
+
+
+def test_visit_to_unknown_session_during_outage_creates_nothing(backend):
+    db, _ = backend
+
+    async def scenario():
+        db.up = False
+        response = await server.mark_zone_visited("no-such-session", "wallaby", x_session_token=None)
+        assert "visited_count" not in response
+
+        db.up = True
+        await server.event_shipper.ship_pending()
+        assert "no-such-session" not in db.sessions.documents
+        with pytest.raises(HTTPException) as error:
+            await server.get_session("no-such-session", x_session_token=None)
+        assert error.value.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_reads_see_writes_from_other_workers(backend):
+    db, _ = backend
+
+    async def scenario():
+        session = await server.create_session()
+        await server.event_shipper.ship_pending()
+        assert (await server.get_session(session.id, x_session_token=None)).visited_zones == []
+
+        db.sessions.documents[session.id]["visited_zones"].append("wallaby")  # written by another worker
+        assert (await server.get_session(session.id, x_session_token=None)).visited_zones == ["wallaby"]
+        response = await server.mark_zone_visited(session.id, "poulailler", x_session_token=None)
+        assert response["visited_count"] == 2
+
+    asyncio.run(scenario())